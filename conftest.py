@@ -0,0 +1,14 @@
+import pytest
+import pandas as pd
+
+EMPLOYEES_URL = "https://api.slingacademy.com/v1/sample-data/files/employees.json"
+
+
+@pytest.fixture(scope="session")
+def live_df():
+    """Fixture to download the live employee JSON once per test session.
+
+    Returns:
+        pd.DataFrame: The raw employee records from the public API.
+    """
+    return pd.read_json(EMPLOYEES_URL)
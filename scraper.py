@@ -1,67 +1,204 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import pyarrow.parquet as pq
+import io
+import os
 import json
-import time
 import sys
+import tempfile
+import time
 import argparse
+import asyncio
 from typing import Dict, List
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 try:
     import streamlit as st
 except ImportError:
     st = None
 
+try:
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+except ImportError:
+    Console = Table = Text = None
+
+CACHE_PATH = 'employees_normalized.parquet'
+CACHE_TTL = 60 * 60  # seconds
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Output dtypes of _normalize, reapplied when reading the parquet cache
+OUTPUT_DTYPES = {'full_name': 'string[pyarrow]', 'email': 'string[pyarrow]', 'phone_clean': 'Int64',
+                 'gender': 'category', 'age': 'int8', 'job_title': 'string[pyarrow]',
+                 'years_of_experience': 'int8', 'salary': 'int32', 'department': 'category',
+                 'designation': 'category'}
+
+_sessions: Dict[int, requests.Session] = {}
+
+
+def _get_session(max_retries: int) -> requests.Session:
+    """Pooled session whose adapter makes up to max_retries attempts with exponential backoff."""
+    if max_retries < 1:
+        raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+    if max_retries not in _sessions:
+        retry = Retry(total=max_retries - 1, backoff_factor=1, status_forcelist=RETRY_STATUSES)
+        adapter = HTTPAdapter(max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _sessions[max_retries] = session
+    return _sessions[max_retries]
+
+
 def scrape_employees(url: str, max_retries: int = 3) -> pd.DataFrame:
     """Fetch and normalize employee data with error handling."""
+    try:
+        response = _get_session(max_retries).get(url, timeout=10)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Request failed: {e}")
+        raise
+    return _normalize(response.content)
+
+
+def _normalize(content: bytes) -> pd.DataFrame:
+    """Parse raw employee JSON and normalize it into the output schema."""
+    df = pd.read_json(io.BytesIO(content), dtype_backend='pyarrow')
+    df[['first_name', 'last_name']] = df[['first_name', 'last_name']].astype('string[pyarrow]')
+    
+    # Data Normalization
+    # 1. Designation based on years_of_experience
+    _check_int_range(df['years_of_experience'], 'int8')
+    df['years_of_experience'] = df['years_of_experience'].astype('int8')
+    edges = np.array([3, 5, 10], dtype=np.int8)
+    labels = ['System Engineer', 'Data Engineer', 'Senior Data Engineer', 'Lead']
+    codes = np.searchsorted(edges, df['years_of_experience'].to_numpy(), side='right').astype(np.int8)
+    df['designation'] = pd.Categorical.from_codes(codes, categories=labels)
+    
+    # 2. Full name
+    df['full_name'] = df['first_name'].str.cat(df['last_name'], sep=' ')
+    
+    # 3. Phone validation - convert invalid numbers (containing 'x') to NaN
+    mask = df['phone'].astype('string').str.contains('x', case=False, na=False)
+    df['phone_clean'] = pd.to_numeric(df['phone'].where(~mask), errors='coerce').astype('Int64')
+    
+    # 4. Data types (string/int as specified, narrowest width that fits)
+    return _apply_schema(df[list(OUTPUT_DTYPES)])
+
+
+def _check_int_range(series: pd.Series, dtype: str) -> None:
+    """Raise ValueError if series holds values a cast to dtype would silently wrap."""
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        raise ValueError(f"{series.name} has values outside the {dtype} range [{info.min}, {info.max}]")
+
+
+def _apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast to OUTPUT_DTYPES, with Arrow-backed string categories for gender and department."""
+    for col, dtype in OUTPUT_DTYPES.items():
+        if dtype in ('int8', 'int32') and df[col].dtype != dtype:
+            _check_int_range(df[col], dtype)
+    df = df.astype(OUTPUT_DTYPES, copy=False)
+    for col in ('gender', 'department'):
+        df[col] = df[col].cat.rename_categories(df[col].cat.categories.astype('string[pyarrow]'))
+    return df
+
+
+async def _fetch(session: "aiohttp.ClientSession", url: str, max_retries: int) -> bytes:
+    """Download one endpoint's raw JSON body, retrying 5xx responses and connection errors."""
     for attempt in range(max_retries):
+        # Same schedule as the urllib3 Retry in _get_session: 0s, 2s, 4s, ...
+        if attempt > 1:
+            await asyncio.sleep(2 ** (attempt - 1))
+        last_attempt = attempt == max_retries - 1
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            df = pd.DataFrame(data)
-            
-            # Data Normalization
-            # 1. Designation based on years_of_experience
-            def get_designation(exp: int) -> str:
-                if exp < 3:
-                    return "System Engineer"
-                elif 3 <= exp < 5:
-                    return "Data Engineer"
-                elif 5 <= exp < 10:
-                    return "Senior Data Engineer"
-                else:
-                    return "Lead"
-            
-            df['designation'] = df['years_of_experience'].apply(get_designation)
-            
-            # 2. Full name
-            df['full_name'] = df['first_name'] + ' ' + df['last_name']
-            
-            # 3. Phone validation - convert invalid numbers (containing 'x') to NaN
-            df['phone_clean'] = pd.to_numeric(df['phone'].apply(lambda p: None if 'x' in str(p).lower() else p), errors='coerce').astype('Int64')
-            
-            # 4. Data types (string/int as specified)
-            df['full_name'] = df['full_name'].astype(str)
-            df['email'] = df['email'].astype(str)
-            df['gender'] = df['gender'].astype(str)
-            df['job_title'] = df['job_title'].astype(str)
-            df['department'] = df['department'].astype(str)
-            df['age'] = df['age'].astype(int)
-            df['years_of_experience'] = df['years_of_experience'].astype(int)
-            df['salary'] = df['salary'].astype(int)
-            
-            return df[['full_name', 'email', 'phone_clean', 'gender', 'age', 'job_title', 
-                       'years_of_experience', 'salary', 'department', 'designation']]
-        
-        except requests.exceptions.RequestException as e:
-            print(f"Attempt {attempt+1} failed: {e}")
-            if attempt == max_retries - 1:
+            async with session.get(url) as response:
+                if response.status in RETRY_STATUSES and not last_attempt:
+                    continue
+                response.raise_for_status()
+                return await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_attempt:
                 raise
-            time.sleep(2 ** attempt)  # Exponential backoff
+
+
+async def scrape_many(urls: List[str], max_retries: int = 3) -> List[pd.DataFrame]:
+    """Fetch several employee endpoints concurrently and normalize each one.
     
+    Each URL gets up to max_retries attempts, like scrape_employees. A URL
+    that still fails raises out of the whole call; no partial results are
+    returned.
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp not installed. Install with: pip install aiohttp")
+    if max_retries < 1:
+        raise ValueError(f"max_retries must be at least 1, got {max_retries}")
     
-    raise ValueError("Failed to fetch data after retries")
+    connector = aiohttp.TCPConnector(limit=32)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        bodies = await asyncio.gather(*[_fetch(session, url, max_retries) for url in urls])
+    return [_normalize(body) for body in bodies]
+
+
+def load_employees(url: str, cache_path: str = CACHE_PATH, ttl: float = CACHE_TTL) -> pd.DataFrame:
+    """Return normalized employee data, reusing the on-disk parquet cache while it is fresh.
+    
+    The cache records the URL it was scraped from and is only reused for that same URL.
+    """
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < ttl:
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if metadata.get(b'source_url') == url.encode():
+                df = _apply_schema(pq.read_table(cache_path).to_pandas())
+                df.attrs['source_mtime'] = os.path.getmtime(cache_path)
+                return df
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Ignoring unreadable cache {cache_path}: {e}")
+    
+    df = scrape_employees(url)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'source_url': url.encode()})
+    # Write beside the target and swap it in, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    df.attrs['source_mtime'] = os.path.getmtime(cache_path)
+    return df
+
+
+def _equals_mask(series: pd.Series, value) -> np.ndarray:
+    """Boolean mask of rows equal to value, compared on integer codes for categorical columns."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if value not in categories:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == categories.get_loc(value)
+    return series.to_numpy() == value
+
+
+def _isin_mask(series: pd.Series, values) -> np.ndarray:
+    """Boolean mask of rows whose value is in values, tested on integer codes for categorical columns."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        selected_codes = series.cat.categories.get_indexer(list(values))
+        return np.isin(series.cat.codes.to_numpy(), selected_codes[selected_codes >= 0])
+    return series.isin(values).to_numpy()
 
 
 def dynamic_cli_query(df: pd.DataFrame, rows: int = 5, filters: Dict = None, columns: List = None) -> None:
@@ -74,27 +211,89 @@ def dynamic_cli_query(df: pd.DataFrame, rows: int = 5, filters: Dict = None, col
         filters: Dictionary of column:value pairs for filtering
         columns: List of specific columns to display (default: all)
     """
-    result_df = df.copy()
+    cols_to_show = [c for c in columns if c in df.columns] if columns else list(df.columns)
     
-    # Apply filters if provided
+    # Apply filters if provided, as a single combined mask over the full frame
     if filters:
-        for col, value in filters.items():
-            if col in result_df.columns:
-                result_df = result_df[result_df[col] == value]
-    
-    # Select specific columns if provided
-    if columns:
-        cols_to_show = [c for c in columns if c in result_df.columns]
-        result_df = result_df[cols_to_show]
+        masks = [_equals_mask(df[col], value) for col, value in filters.items() if col in df.columns]
+        mask = np.logical_and.reduce(masks) if masks else np.ones(len(df), dtype=bool)
+        result_df = df.loc[mask, cols_to_show]
+    else:
+        result_df = df[cols_to_show] if columns else df
     
     # Display results
     print(f"\n{'='*80}")
     print(f"Query Results: Displaying {min(rows, len(result_df))} of {len(result_df)} rows")
     print(f"{'='*80}\n")
-    print(result_df.head(rows).to_string())
+    # rich only renders to a terminal; piped output keeps the untruncated to_string() layout
+    console = Console() if Console is not None else None
+    if console is None or not console.is_terminal:
+        print(result_df.head(rows).to_string())
+    else:
+        table = Table()
+        for col in result_df.columns:
+            table.add_column(str(col), overflow="fold")
+        for row in result_df.head(rows).itertuples(index=False, name=None):
+            table.add_row(*(Text(str(value)) for value in row))
+        console.print(table)
     print(f"\n{'='*80}\n")
 
 
+def _filter_options(df: pd.DataFrame) -> tuple:
+    """Distinct department, designation and gender values for the sidebar filters."""
+    def options(series: pd.Series) -> list:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.categories.to_list()
+        return series.unique().tolist()
+    
+    return options(df['department']), options(df['designation']), options(df['gender'])
+
+
+def _codes(series: pd.Series) -> tuple:
+    """Integer codes (-1 for missing) and their labels, reusing the dictionary of categorical columns."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def _bincount(series: pd.Series, weights: np.ndarray = None) -> pd.Series:
+    """Per-label row count, or sum of weights, via np.bincount; labels with no rows are omitted."""
+    codes, labels = _codes(series)
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], minlength=len(labels))
+    totals = counts if weights is None else np.bincount(codes[valid], weights=weights[valid], minlength=len(labels))
+    present = counts > 0
+    return pd.Series(totals[present], index=labels[present])
+
+
+def _data_key(df: pd.DataFrame) -> tuple:
+    """Cheap fingerprint of a frame: cache file mtime (set by load_employees), row count, last index label."""
+    return df.attrs.get('source_mtime'), len(df), str(df.index[-1]) if len(df) else None
+
+
+def _aggregates(_filtered_df: pd.DataFrame, data_key: tuple, selected_department: tuple,
+                selected_designation: tuple, selected_gender: tuple) -> tuple:
+    """Salary-by-department and headcount aggregates for the dashboard charts.
+    
+    The leading underscore keeps Streamlit from hashing the frame; the
+    cache is keyed on the source frame's data_key plus the filter
+    selections that produced it.
+    """
+    salary = _filtered_df['salary'].to_numpy()
+    salary_by_dept = (_bincount(_filtered_df['department'], salary) /
+                      _bincount(_filtered_df['department'])).sort_values(ascending=False)
+    dept_count = _bincount(_filtered_df['department']).sort_values(ascending=False)
+    desig_count = _bincount(_filtered_df['designation']).sort_values(ascending=False)
+    return salary_by_dept, dept_count, desig_count
+
+
+if st is not None:
+    _cached_aggregates = st.cache_data(ttl=CACHE_TTL)(_aggregates)
+else:
+    _cached_aggregates = _aggregates
+
+
 def launch_pygwalker_ui(df: pd.DataFrame) -> None:
     """
     Launch Streamlit interactive BI dashboard.
@@ -112,44 +311,47 @@ def launch_pygwalker_ui(df: pd.DataFrame) -> None:
     
     # Sidebar filters
     st.sidebar.header("🔍 Filters")
-    selected_department = st.sidebar.multiselect("Department", df['department'].unique(), default=df['department'].unique())
-    selected_designation = st.sidebar.multiselect("Designation", df['designation'].unique(), default=df['designation'].unique())
-    selected_gender = st.sidebar.multiselect("Gender", df['gender'].unique(), default=df['gender'].unique())
+    departments, designations, genders = _filter_options(df)
+    selected_department = st.sidebar.multiselect("Department", departments, default=departments)
+    selected_designation = st.sidebar.multiselect("Designation", designations, default=designations)
+    selected_gender = st.sidebar.multiselect("Gender", genders, default=genders)
     
     # Apply filters
-    filtered_df = df[
-        (df['department'].isin(selected_department)) &
-        (df['designation'].isin(selected_designation)) &
-        (df['gender'].isin(selected_gender))
-    ]
+    mask = _isin_mask(df['department'], selected_department)
+    mask &= _isin_mask(df['designation'], selected_designation)
+    mask &= _isin_mask(df['gender'], selected_gender)
+    filtered_df = df.iloc[mask]
     
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Employees", len(filtered_df))
-    col2.metric("Avg Salary", f"${filtered_df['salary'].mean():,.0f}")
-    col3.metric("Avg Age", f"{filtered_df['age'].mean():.1f}")
-    col4.metric("Avg Experience", f"{filtered_df['years_of_experience'].mean():.1f} years")
+    stats = filtered_df[['salary', 'age', 'years_of_experience']].mean(numeric_only=True)
+    col2.metric("Avg Salary", f"${stats['salary']:,.0f}")
+    col3.metric("Avg Age", f"{stats['age']:.1f}")
+    col4.metric("Avg Experience", f"{stats['years_of_experience']:.1f} years")
     
     # Charts using native Streamlit
     st.subheader("📈 Salary by Department")
-    salary_by_dept = filtered_df.groupby('department')['salary'].mean().sort_values(ascending=False)
+    salary_by_dept, dept_count, desig_count = _cached_aggregates(
+        filtered_df, _data_key(df), tuple(selected_department), tuple(selected_designation),
+        tuple(selected_gender)
+    )
     st.bar_chart(salary_by_dept)
     
     st.subheader("👥 Employee Distribution")
     col1, col2 = st.columns(2)
     with col1:
-        dept_count = filtered_df['department'].value_counts()
         st.write("By Department")
         st.bar_chart(dept_count)
     with col2:
-        desig_count = filtered_df['designation'].value_counts()
         st.write("By Designation")
         st.bar_chart(desig_count)
     
     st.subheader("📊 Experience vs Salary")
-    scatter_data = filtered_df[['years_of_experience', 'salary']].rename(
-        columns={'years_of_experience': 'Experience', 'salary': 'Salary'}
-    )
+    scatter_data = pd.DataFrame({
+        'Experience': filtered_df['years_of_experience'].to_numpy(copy=False),
+        'Salary': filtered_df['salary'].to_numpy(copy=False),
+    })
     st.scatter_chart(scatter_data)
     
     # Data Table
@@ -167,12 +369,14 @@ if __name__ == "__main__":
     parser.add_argument("--columns", nargs="+", help="Specific columns to display")
     parser.add_argument("--all", action="store_true", help="Display all rows")
     parser.add_argument("--ui", action="store_true", help="Launch PyGWalker interactive BI dashboard")
+    parser.add_argument("--csv", action="store_true", help="Also export employees_normalized.csv")
     
     args = parser.parse_args()
     
     url = "https://api.slingacademy.com/v1/sample-data/files/employees.json"
-    df_normalized = scrape_employees(url)
-    df_normalized.to_csv('employees_normalized.csv', index=False)
+    df_normalized = load_employees(url)
+    if args.csv:
+        pacsv.write_csv(pa.Table.from_pandas(df_normalized, preserve_index=False), 'employees_normalized.csv')
     
     # Launch Streamlit dashboard if requested
     if args.ui:
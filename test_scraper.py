@@ -1,7 +1,15 @@
+import asyncio
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
+import numpy as np
 import pandas as pd
+import requests
 from unittest.mock import patch, MagicMock
-from scraper import scrape_employees  
+from scraper import (scrape_employees, scrape_many, load_employees, dynamic_cli_query, _normalize,
+                     _aggregates, _equals_mask, _isin_mask)
 
 @pytest.fixture
 def sample_data():
@@ -16,12 +24,42 @@ def sample_data():
          "years_of_experience":1, "salary":8500, "department":"Product"}
     ]
 
+@pytest.fixture
+def http_server():
+    """Fixture to serve scripted responses from a local HTTP server.
+
+    Yields:
+        tuple: (base_url, routes, hits). routes maps a path to a list of
+        (status, body) pairs served in order, the last one repeating;
+        hits counts the requests received per path.
+    """
+    routes, hits = {}, {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            responses = routes.get(self.path, [(404, b"")])
+            status, body = responses.pop(0) if len(responses) > 1 else responses[0]
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", routes, hits
+    server.shutdown()
+    server.server_close()
+
 def test_json_download_success(sample_data):
     """Test Case 1: Verify JSON File Download"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = sample_data
+        mock_response.content = json.dumps(sample_data).encode()
         mock_get.return_value = mock_response
         
         df = scrape_employees("https://test.com")
@@ -30,22 +68,21 @@ def test_json_download_success(sample_data):
 
 def test_json_extraction(sample_data):
     """Test Case 2: Verify JSON File Extraction"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = sample_data
+        mock_response.content = json.dumps(sample_data).encode()
         mock_get.return_value = mock_response
         
         df = scrape_employees("https://test.com")
         assert 'years_of_experience' in df.columns
         assert df['designation'].iloc[0] == "System Engineer"  # <3 years
 
-def test_validate_file_type():
+def test_validate_file_type(live_df):
     """Test Case 3: Validate File Type and Format"""
-    # JSON validation via pandas read_json
-    df = pd.read_json("https://api.slingacademy.com/v1/sample-data/files/employees.json")
-    assert isinstance(df, pd.DataFrame)
-    assert len(df) > 0
+    # JSON validation via pandas read_json (session-scoped fixture in conftest.py)
+    assert isinstance(live_df, pd.DataFrame)
+    assert len(live_df) > 0
 
 def test_validate_data_structure(sample_data):
     """Test Case 4: Validate Data Structure"""
@@ -64,4 +101,180 @@ def test_handle_missing_data():
     with pytest.raises(TypeError):
         pd.DataFrame(invalid_data)['years_of_experience'].apply(lambda x: int(x))  # Simulates type error handling
 
-# Run: pytest tests.py -v
+def test_load_employees_uses_fresh_cache(sample_data, tmp_path):
+    """Test Case 6: Reuse Parquet Cache While Fresh, With the Same Schema"""
+    cache_path = str(tmp_path / "employees.parquet")
+    with patch('requests.Session.get') as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(sample_data).encode()
+        mock_get.return_value = mock_response
+        
+        miss = load_employees("https://test.com", cache_path=cache_path)
+        hit = load_employees("https://test.com", cache_path=cache_path)
+        assert mock_get.call_count == 1
+        pd.testing.assert_series_equal(miss.dtypes, hit.dtypes)
+        pd.testing.assert_frame_equal(miss, hit)
+        
+        load_employees("https://other.com", cache_path=cache_path)
+        assert mock_get.call_count == 2
+
+def test_scrape_retries_server_errors(sample_data, http_server):
+    """Test Case 7: Retry 5xx Responses Through the HTTP Adapter"""
+    base_url, routes, hits = http_server
+    routes["/employees.json"] = [(503, b""), (200, json.dumps(sample_data).encode())]
+    df = scrape_employees(f"{base_url}/employees.json")
+    assert hits["/employees.json"] == 2
+    assert df['full_name'].iloc[0] == "Jose Lopez"
+
+def test_scrape_gives_up_after_max_retries(http_server):
+    """Test Case 8: Stop After max_retries Attempts"""
+    base_url, routes, hits = http_server
+    routes["/employees.json"] = [(503, b"")]
+    with pytest.raises(requests.exceptions.RetryError):
+        scrape_employees(f"{base_url}/employees.json", max_retries=2)
+    assert hits["/employees.json"] == 2
+
+def test_cli_query_prints_full_values(sample_data, capsys):
+    """Test Case 9: CLI Output Does Not Truncate Values"""
+    df = _normalize(json.dumps(sample_data).encode())
+    dynamic_cli_query(df)
+    out = capsys.readouterr().out
+    assert "test@email.com" in out
+    assert "System Engineer" in out
+
+def test_cli_query_rich_table_on_terminal(sample_data):
+    """Test Case 10: Rich Table Output on a Terminal"""
+    rich_console = pytest.importorskip("rich.console")
+    buffer = io.StringIO()
+    console = rich_console.Console(file=buffer, force_terminal=True, color_system=None, width=80)
+    df = _normalize(json.dumps(sample_data).encode())
+    with patch('scraper.Console', return_value=console):
+        dynamic_cli_query(df, columns=['email', 'designation'])
+    out = buffer.getvalue()
+    assert "test@email.com" in out
+    assert "System Engineer" in out
+
+@pytest.fixture
+def staff_df():
+    """Fixture to return a small frame with one unobserved department category.
+
+    Returns:
+        pd.DataFrame: Five employees across two of three department categories.
+    """
+    return pd.DataFrame({
+        'department': pd.Categorical(["Product", "Sales", "Product", "Sales", "Product"],
+                                     categories=["Marketing", "Product", "Sales"]),
+        'designation': ["Lead", "Data Engineer", "Lead", "Lead", "System Engineer"],
+        'salary': np.array([8500, 7000, 9500, 6000, 5000], dtype=np.int32),
+    })
+
+@pytest.mark.parametrize("categorical", [True, False])
+def test_aggregates_match_groupby(staff_df, categorical):
+    """Test Case 11: Bincount Aggregates Match groupby and value_counts"""
+    if not categorical:
+        staff_df['department'] = staff_df['department'].astype(str)
+    salary_by_dept, dept_count, desig_count = _aggregates(staff_df, None, (), (), ())
+    expected = staff_df.groupby('department', observed=True)['salary'].mean()
+    assert salary_by_dept.to_dict() == pytest.approx(expected.to_dict())
+    assert list(salary_by_dept.index) == ["Product", "Sales"]
+    assert dept_count.to_dict() == {"Product": 3, "Sales": 2}
+    assert desig_count.to_dict() == {"Lead": 3, "Data Engineer": 1, "System Engineer": 1}
+
+def test_aggregates_empty_selection(staff_df):
+    """Test Case 12: Aggregates of an Empty Selection Are Empty"""
+    salary_by_dept, dept_count, desig_count = _aggregates(staff_df.iloc[:0], None, (), (), ())
+    assert salary_by_dept.empty and dept_count.empty and desig_count.empty
+
+@pytest.mark.parametrize("categorical", [True, False])
+def test_isin_mask(staff_df, categorical):
+    """Test Case 13: Multiselect Mask on Codes and Fallback"""
+    series = staff_df['department'] if categorical else staff_df['department'].astype(str)
+    assert _isin_mask(series, ["Sales"]).tolist() == [False, True, False, True, False]
+    assert not _isin_mask(series, []).any()
+    assert not _isin_mask(series, ["Marketing", "Unknown"]).any()
+    assert _isin_mask(series, ["Product", "Sales"]).all()
+
+@pytest.mark.parametrize("categorical", [True, False])
+def test_equals_mask(staff_df, categorical):
+    """Test Case 14: CLI Filter Mask on Codes and Fallback"""
+    series = staff_df['department'] if categorical else staff_df['department'].astype(str)
+    assert _equals_mask(series, "Product").tolist() == [True, False, True, False, True]
+    assert not _equals_mask(series, "Marketing").any()
+    assert not _equals_mask(series, "Unknown").any()
+
+def test_scrape_many_concurrent(sample_data, http_server):
+    """Test Case 15: Scrape Several Endpoints Concurrently, Retrying 5xx"""
+    aiohttp = pytest.importorskip("aiohttp")
+    base_url, routes, hits = http_server
+    body = json.dumps(sample_data).encode()
+    routes["/a.json"] = [(200, body)]
+    routes["/b.json"] = [(503, b""), (200, body)]
+    frames = asyncio.run(scrape_many([f"{base_url}/a.json", f"{base_url}/b.json"]))
+    assert [df['full_name'].iloc[0] for df in frames] == ["Jose Lopez", "Jose Lopez"]
+    assert hits["/b.json"] == 2
+
+    routes["/missing.json"] = [(404, b"")]
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(scrape_many([f"{base_url}/a.json", f"{base_url}/missing.json"]))
+    assert hits["/missing.json"] == 1
+
+def test_aggregates_omit_deselected_designations(staff_df):
+    """Test Case 16: Deselected Categorical Designations Are Not Charted"""
+    staff_df['designation'] = pd.Categorical(staff_df['designation'],
+                                             categories=["System Engineer", "Data Engineer", "Lead"])
+    filtered_df = staff_df[staff_df['designation'] == "Lead"]
+    _, _, desig_count = _aggregates(filtered_df, None, (), ("Lead",), ())
+    assert desig_count.to_dict() == {"Lead": 3}
+
+@pytest.mark.parametrize("years, designation", [
+    (0, "System Engineer"), (2, "System Engineer"),
+    (3, "Data Engineer"), (4, "Data Engineer"),
+    (5, "Senior Data Engineer"), (9, "Senior Data Engineer"),
+    (10, "Lead"), (11, "Lead"), (40, "Lead"),
+])
+def test_designation_boundaries(sample_data, years, designation):
+    """Test Case 17: Designation Bucket Boundaries"""
+    sample_data[0]['years_of_experience'] = years
+    df = _normalize(json.dumps(sample_data).encode())
+    assert df['designation'].iloc[0] == designation
+
+@pytest.mark.parametrize("column, value", [
+    ('age', 130), ('years_of_experience', 200), ('salary', 3_000_000_000),
+])
+def test_out_of_range_values_raise(sample_data, column, value):
+    """Test Case 18: Reject Values That Do Not Fit the Narrowed Dtype"""
+    sample_data[0][column] = value
+    with pytest.raises(ValueError, match=column):
+        _normalize(json.dumps(sample_data).encode())
+
+def test_load_employees_rescrapes_expired_or_corrupt_cache(sample_data, tmp_path):
+    """Test Case 19: Re-scrape When the Cache Is Expired or Unreadable"""
+    cache_path = tmp_path / "employees.parquet"
+    with patch('requests.Session.get') as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(sample_data).encode()
+        mock_get.return_value = mock_response
+        
+        load_employees("https://test.com", cache_path=str(cache_path), ttl=0)
+        load_employees("https://test.com", cache_path=str(cache_path), ttl=0)
+        assert mock_get.call_count == 2
+        
+        cache_path.write_bytes(cache_path.read_bytes()[:20])
+        df = load_employees("https://test.com", cache_path=str(cache_path))
+        assert mock_get.call_count == 3
+        assert df['full_name'].iloc[0] == "Jose Lopez"
+        assert load_employees("https://test.com", cache_path=str(cache_path)).equals(df)
+        assert mock_get.call_count == 3
+        assert [p.name for p in tmp_path.iterdir()] == ["employees.parquet"]
+
+def test_max_retries_must_be_positive():
+    """Test Case 20: Reject max_retries Below One"""
+    with pytest.raises(ValueError, match="max_retries"):
+        scrape_employees("https://test.com", max_retries=0)
+    pytest.importorskip("aiohttp")
+    with pytest.raises(ValueError, match="max_retries"):
+        asyncio.run(scrape_many(["https://test.com"], max_retries=0))
+
+# Run: pytest test_scraper.py -n auto -v